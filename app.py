@@ -4,6 +4,7 @@ Helps users understand Old vs New tax regime, compare outcomes, and get RAG-back
 Run: streamlit run app.py (from project root, with venv activated).
 """
 
+import re
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -11,7 +12,7 @@ load_dotenv(Path(__file__).resolve().parent / ".env")
 
 import streamlit as st
 from tax_engine import calculate_comprehensive, calculate_tax_old_regime, calculate_tax_new_regime
-from groq_client import chat, is_configured
+from groq_client import chat, chat_batched, is_configured
 from rag import retrieve, format_chunks_for_prompt, get_full_context
 from guardrails import (
     validate_and_sanitize_inputs,
@@ -20,6 +21,22 @@ from guardrails import (
     get_system_guardrail,
 )
 
+STATE_OPTIONS = ("Delhi", "Maharashtra", "Karnataka", "Tamil Nadu", "West Bengal", "Gujarat", "Kerala", "Others")
+CITY_TYPE_OPTIONS = ("Non-Metro", "Metro")
+MAX_BATCHED_QUESTIONS = 3
+
+
+@st.cache_data(show_spinner=False)
+def cached_calculate(data_items: tuple) -> dict:
+    """Tax comparison memoized on the sanitized inputs, so unrelated reruns skip the engine."""
+    return calculate_comprehensive(dict(data_items))
+
+
+@st.cache_data(show_spinner=False)
+def cached_retrieve(query: str, top_k: int = 5) -> list[dict]:
+    return retrieve(query, top_k=top_k)
+
+
 st.set_page_config(
     page_title="AI Tax Regime Navigator",
     page_icon="📋",
@@ -33,11 +50,8 @@ st.caption("Understand Old vs New regime, compare your tax, and get rule-based g
 with st.sidebar:
     st.header("Your details")
     age = st.number_input("Age", min_value=18, max_value=120, value=30, step=1)
-    state = st.selectbox(
-        "State (for Professional Tax)",
-        ["Delhi", "Maharashtra", "Karnataka", "Tamil Nadu", "West Bengal", "Gujarat", "Kerala", "Others"],
-    )
-    city_type = st.radio("City type (for HRA)", ["Non-Metro", "Metro"], horizontal=True)
+    state = st.selectbox("State (for Professional Tax)", STATE_OPTIONS)
+    city_type = st.radio("City type (for HRA)", CITY_TYPE_OPTIONS, horizontal=True)
 
     st.subheader("Income (₹/year)")
     annual_income = st.number_input("Salary / Business income", min_value=0.0, value=800000.0, step=10000.0)
@@ -77,7 +91,7 @@ for w in validation_warnings:
     st.sidebar.warning(w)
 
 # Calculate
-result = calculate_comprehensive(data)
+result = cached_calculate(tuple(sorted(data.items())))
 old_r = result["old_regime"]
 new_r = result["new_regime"]
 best = result["best_regime"]
@@ -125,45 +139,80 @@ st.divider()
 st.subheader("Ask about rules & regime choice")
 st.caption("Answers are based on official provisions (RAG) and may flag common mistakes.")
 
+submitted = False
 if not is_configured():
     st.warning("Set GROQ_API_KEY in .env to use AI explanations.")
     user_question = None
 else:
-    default_q = "When should I choose Old vs New regime? What are common mistakes?"
-    user_question = st.text_input(
-        "Your question (e.g. eligibility, deductions, compliance risks)",
-        value=default_q,
-        key="user_question",
-    )
-
-if user_question and is_configured():
-    if st.button("Get AI guidance"):
-        blocked, block_msg = should_block_query(user_question)
-        if blocked:
+    # Inside a form, typing does not rerun the script; only the submit button does
+    with st.form("ai_form"):
+        default_q = "When should I choose Old vs New regime? What are common mistakes?"
+        user_question = st.text_area(
+            f"Your question (e.g. eligibility, deductions, compliance risks); "
+            f"separate up to {MAX_BATCHED_QUESTIONS} questions with a blank line to ask them in a single request",
+            value=default_q,
+            key="user_question",
+        )
+        submitted = st.form_submit_button("Get AI guidance")
+
+if submitted:
+    # Questions are separated by blank lines; line breaks inside a question are joined so each
+    # question is guarded (and sent) as one unit
+    questions = [" ".join(q.split()) for q in re.split(r"\n\s*\n", user_question or "") if q.strip()] or [""]
+    if len(questions) > MAX_BATCHED_QUESTIONS:
+        skipped = len(questions) - MAX_BATCHED_QUESTIONS
+        st.info(
+            f"Only the first {MAX_BATCHED_QUESTIONS} questions are answered per request; "
+            f"{skipped} more were not sent. Ask them in a follow-up request."
+        )
+        questions = questions[:MAX_BATCHED_QUESTIONS]
+
+    allowed = []
+    for q in questions:
+        blocked, block_msg = should_block_query(q)
+        if not blocked:
+            allowed.append(q)
+        elif len(questions) == 1:
             st.warning(block_msg)
         else:
-            with st.spinner("Retrieving provisions and generating answer..."):
-                # RAG: retrieve relevant chunks
-                chunks = retrieve(user_question, top_k=5)
-                context = format_chunks_for_prompt(chunks) if chunks else get_full_context()
-                system = get_system_guardrail()
-                user_msg = (
-                    "Official provisions (use only these for rules):\n\n" + context + "\n\n"
-                    "User question: " + user_question + "\n\n"
-                    "User situation summary: "
-                    f"Age {data['age']}, Gross income ₹{data['annual_income'] + data['income_from_interest'] + data['income_from_other_sources']:,.0f}, "
-                    f"80C ₹{data['section_80c']:,.0f}, 80D ₹{data['section_80d']:,.0f}. "
-                    f"Calculated best regime for them: {best}. "
-                    "Explain clearly and flag any common misinterpretations or compliance risks."
-                )
-                try:
-                    reply = chat([
-                        {"role": "system", "content": system},
-                        {"role": "user", "content": user_msg},
-                    ])
-                    st.markdown(reply)
-                except Exception as e:
-                    st.error(f"AI request failed: {e}")
+            st.warning(f"**{q}** – {block_msg}")
+
+    if allowed:
+        with st.spinner("Retrieving provisions..."):
+            # RAG: retrieve relevant chunks once for all questions
+            chunks = cached_retrieve(" ".join(allowed), top_k=5)
+            context = format_chunks_for_prompt(chunks) if chunks else get_full_context()
+        system = get_system_guardrail()
+        provisions = "Official provisions (use only these for rules):\n\n" + context + "\n\n"
+        situation = (
+            "User situation summary: "
+            f"Age {data['age']}, Gross income ₹{data['annual_income'] + data['income_from_interest'] + data['income_from_other_sources']:,.0f}, "
+            f"80C ₹{data['section_80c']:,.0f}, 80D ₹{data['section_80d']:,.0f}. "
+            f"Calculated best regime for them: {best}. "
+            "Explain clearly and flag any common misinterpretations or compliance risks."
+        )
+        try:
+            if len(allowed) == 1:
+                user_msg = provisions + "User question: " + allowed[0] + "\n\n" + situation
+                # Render tokens as they arrive instead of waiting for the full answer
+                st.write_stream(chat([
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": user_msg},
+                ], stream=True))
+            else:
+                # Several questions share one request so the provisions are sent only once
+                with st.spinner("Generating answers..."):
+                    answers = chat_batched(allowed, system, provisions + situation)
+                if len(answers) != len(allowed):
+                    # Reply could not be split per question: show it once under all of them
+                    st.markdown("\n".join(f"- **{q}**" for q in allowed))
+                    st.markdown(answers[0])
+                else:
+                    for q, answer in zip(allowed, answers):
+                        st.markdown(f"**{q}**")
+                        st.markdown(answer or "_No separate answer was returned for this question._")
+        except Exception as e:
+            st.error(f"AI request failed: {e}")
 
 # Footer disclaimer
 st.divider()
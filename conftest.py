@@ -0,0 +1,4 @@
+"""
+Pytest root marker: makes the project-root modules (tax_engine, rag, ...) importable from tests/
+when running plain `pytest`.
+"""
@@ -4,20 +4,57 @@ Uses a single AI model for explanations, regime guidance, and RAG-backed answers
 """
 
 import os
+import re
+import threading
+from collections.abc import Iterator
 from groq import Groq
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY", "").strip()
 DEFAULT_MODEL = "llama-3.3-70b-versatile"
 
+_client: Groq | None = None
+_client_lock = threading.Lock()
+
+# "Answer 2:" markers separating answers in a batched reply; tolerates markdown headings and
+# bold on either side of the colon ("### Answer 2:", "**Answer 2:**", "**Answer 2**:")
+_ANSWER_MARKER_RE = re.compile(
+    r"^\s*(?:#+\s*)?\**\s*Answer\s+(\d+)\s*\**\s*[:.)]\**", re.IGNORECASE | re.MULTILINE
+)
+# Plain "2) ..." / "2. ..." numbering, only trusted when it numbers exactly the questions asked
+_NUMBERED_MARKER_RE = re.compile(r"^\s*(?:#+\s*)?\**\s*(\d+)\s*\**\s*[.)]\**", re.MULTILINE)
+
 
 def get_client() -> Groq:
+    """Return the shared Groq client, creating it on first use so its connection pool is reused."""
+    global _client
     if not GROQ_API_KEY:
         raise ValueError("GROQ_API_KEY is not set. Add it to .env or environment.")
-    return Groq(api_key=GROQ_API_KEY)
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Groq(api_key=GROQ_API_KEY)
+    return _client
+
+
+def _stream_chat(messages: list[dict], model: str) -> Iterator[str]:
+    """Yield assistant reply text as Groq streams it."""
+    client = get_client()
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=0.3,
+        max_tokens=2048,
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices:
+            yield chunk.choices[0].delta.content or ""
 
 
-def chat(messages: list[dict], model: str = DEFAULT_MODEL) -> str:
-    """Send messages to Groq and return assistant reply text."""
+def chat(messages: list[dict], model: str = DEFAULT_MODEL, stream: bool = False) -> str | Iterator[str]:
+    """Send messages to Groq and return assistant reply text (or a text-chunk iterator if stream=True)."""
+    if stream:
+        return _stream_chat(messages, model)
     client = get_client()
     resp = client.chat.completions.create(
         model=model,
@@ -30,5 +67,46 @@ def chat(messages: list[dict], model: str = DEFAULT_MODEL) -> str:
     return (resp.choices[0].message.content or "").strip()
 
 
+def _split_answers(reply: str, count: int) -> list[str] | None:
+    """Split a batched reply into `count` answers by their markers.
+    Returns None when the reply has text before the first marker or markers that repeat or
+    skip numbers, so nothing the model wrote is dropped or attributed to the wrong question."""
+    markers = list(_ANSWER_MARKER_RE.finditer(reply))
+    numbers = [int(m.group(1)) for m in markers]
+    if not markers:
+        # Fall back to plain numbering, but only when it is exactly 1..count (not a list inside an answer)
+        markers = list(_NUMBERED_MARKER_RE.finditer(reply))
+        numbers = [int(m.group(1)) for m in markers]
+        if numbers != list(range(1, count + 1)):
+            return None
+    if len(numbers) > count or numbers != list(range(1, len(numbers) + 1)):
+        return None
+    if reply[:markers[0].start()].strip():
+        return None
+    answers = [""] * count
+    for i, (m, nxt) in enumerate(zip(markers, markers[1:] + [None])):
+        answers[i] = reply[m.end():nxt.start() if nxt else len(reply)].strip()
+    return answers
+
+
+def chat_batched(questions: list[str], system: str, context: str, model: str = DEFAULT_MODEL) -> list[str]:
+    """Answer several questions in one request so the shared context is sent once.
+    Returns one answer per question ("" if the model skipped one), or a single-item list with
+    the whole reply when it cannot be split by question."""
+    numbered = "\n".join(f"{i}) {q}" for i, q in enumerate(questions, 1))
+    user_msg = (
+        context + "\n\n"
+        "Answer each numbered question separately. Start each answer on its own line with "
+        "'Answer N:' where N is the question number.\n\n" + numbered
+    )
+    reply = chat([
+        {"role": "system", "content": system},
+        {"role": "user", "content": user_msg},
+    ], model=model)
+
+    answers = _split_answers(reply, len(questions))
+    return [reply] if answers is None else answers
+
+
 def is_configured() -> bool:
     return bool(GROQ_API_KEY)
@@ -3,12 +3,20 @@ RAG (Retrieval-Augmented Generation) for official tax provisions.
 Loads data/official_provisions.md, chunks by sections, and retrieves relevant text for LLM context.
 """
 
+import heapq
 import re
+from functools import lru_cache
 from pathlib import Path
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 PROVISIONS_FILE = DATA_DIR / "official_provisions.md"
 
+# Word-ish tokens of two or more characters (e.g. "80c", "regime"); single characters are noise
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+
+# Longest body sent to the LLM for a single section
+MAX_PROMPT_CHARS_PER_CHUNK = 1500
+
 _chunks_cache: list[dict] | None = None
 
 
@@ -18,11 +26,7 @@ def _load_and_chunk() -> list[dict]:
     if _chunks_cache is not None:
         return _chunks_cache
 
-    if not PROVISIONS_FILE.exists():
-        _chunks_cache = []
-        return _chunks_cache
-
-    text = PROVISIONS_FILE.read_text(encoding="utf-8")
+    text = get_full_context()
     chunks = []
     # Split by ## or ### headers
     parts = re.split(r"\n(?=##\s)", text)
@@ -30,24 +34,49 @@ def _load_and_chunk() -> list[dict]:
         part = part.strip()
         if not part:
             continue
-        # First line as title
-        lines = part.split("\n")
+        # First line as title; trailing whitespace is dropped once here rather than per query
+        lines = [line.rstrip() for line in part.splitlines()]
         title = lines[0].lstrip("#").strip() if lines else "Section"
-        content = "\n".join(lines).strip()
-        chunks.append({"title": title, "content": content, "text": content})
+        content = "\n".join(lines)
+        chunks.append({
+            "title": title,
+            "content": content,
+            "text": content,
+            "tokens": frozenset(_TOKEN_RE.findall(content.lower())),
+            "prompt": _compact_for_prompt("\n".join(lines[1:])),
+        })
 
     _chunks_cache = chunks
     return chunks
 
 
-def _score_chunk(chunk: dict, query: str) -> float:
-    """Simple keyword relevance: count of query tokens in chunk (case-insensitive)."""
-    q = query.lower().strip()
-    if not q:
-        return 0
-    tokens = set(re.split(r"\s+", q))
-    text = (chunk.get("content") or chunk.get("text") or "").lower()
-    return sum(1 for t in tokens if t in text and len(t) > 1)
+def _compact_for_prompt(body: str) -> str:
+    """Section body (without its header line) with redundant whitespace removed and length capped."""
+    body = re.sub(r"[ \t]+", " ", body)
+    body = re.sub(r"\n\s*\n+", "\n", body).strip()
+    if len(body) <= MAX_PROMPT_CHARS_PER_CHUNK:
+        return body
+    # Keep the opening up to a sentence/line boundary plus the closing sentence
+    sentences = re.split(r"(?<=[.!?])\s+", body)
+    tail = sentences[-1] if len(sentences) > 1 else ""
+    if len(tail) >= MAX_PROMPT_CHARS_PER_CHUNK // 2:
+        tail = ""  # A closing sentence this long would crowd out the opening
+    sep = "\n…\n" if tail else "\n…"
+    head = body[:MAX_PROMPT_CHARS_PER_CHUNK - len(sep) - len(tail)]
+    cut = max(head.rfind(". "), head.rfind("\n"))
+    if cut > 0:
+        head = head[:cut + 1]
+    return f"{head.rstrip()}{sep}{tail}"
+
+
+def _query_tokens(query: str) -> frozenset[str]:
+    """Lowercased query tokens, tokenized the same way as chunks."""
+    return frozenset(_TOKEN_RE.findall(query.lower()))
+
+
+def _score_chunk(chunk: dict, tokens: frozenset[str]) -> float:
+    """Simple keyword relevance: number of query tokens that also occur in the chunk."""
+    return len(chunk["tokens"] & tokens)
 
 
 def retrieve(query: str, top_k: int = 5) -> list[dict]:
@@ -55,22 +84,29 @@ def retrieve(query: str, top_k: int = 5) -> list[dict]:
     chunks = _load_and_chunk()
     if not chunks:
         return []
-    scored = [(c, _score_chunk(c, query)) for c in chunks]
-    scored.sort(key=lambda x: -x[1])
-    return [c for c, _ in scored[:top_k]]
+    tokens = _query_tokens(query)
+    scored = [(c, _score_chunk(c, tokens)) for c in chunks]
+    return [c for c, _ in heapq.nlargest(top_k, scored, key=lambda x: x[1])]
 
 
+@lru_cache(maxsize=1)
 def get_full_context() -> str:
-    """Return full provisions text for fallback or when no specific query."""
+    """Return full provisions text for fallback or when no specific query (read once per process)."""
     if not PROVISIONS_FILE.exists():
         return ""
     return PROVISIONS_FILE.read_text(encoding="utf-8").strip()
 
 
+@lru_cache(maxsize=64)
+def _format_sections(sections: tuple[tuple[str, str], ...]) -> str:
+    return "\n---\n".join(f"## {title}\n{content}".rstrip() for title, content in sections)
+
+
 def format_chunks_for_prompt(chunks: list[dict]) -> str:
     """Format retrieved chunks as a single string for LLM system/user context."""
     if not chunks:
         return get_full_context()
-    return "\n\n---\n\n".join(
-        f"## {c.get('title', '')}\n{c.get('content', c.get('text', ''))}" for c in chunks
-    )
+    # Repeated questions retrieve the same sections, so the joined prompt text is memoized
+    return _format_sections(tuple(
+        (c.get("title", ""), c.get("prompt", c.get("content", c.get("text", "")))) for c in chunks
+    ))
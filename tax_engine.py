@@ -3,70 +3,174 @@ Tax calculation engine for Old and New regime (India FY 2024-25 / AY 2025-26).
 Used by the AI Tax Regime Navigator for computations only; explanations come from RAG + LLM.
 """
 
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Slab tables: (upper limit of slab, marginal rate, tax accumulated below the slab)
+OLD_REGIME_SLABS = (
+    (250000, 0.00, 0),
+    (500000, 0.05, 0),
+    (1000000, 0.20, 12500),
+    (float("inf"), 0.30, 112500),
+)
+NEW_REGIME_SLABS = (
+    (300000, 0.00, 0),
+    (600000, 0.05, 0),
+    (900000, 0.10, 15000),
+    (1200000, 0.15, 45000),
+    (1500000, 0.20, 90000),
+    (float("inf"), 0.30, 150000),
+)
+STANDARD_DEDUCTION = 50000
+OLD_REGIME_REBATE_LIMIT = 500000  # 87A
+NEW_REGIME_REBATE_LIMIT = 700000  # 87A
+
+_HIGH_PT_STATES = frozenset({
+    "maharashtra", "karnataka", "telangana", "andhra pradesh",
+    "west bengal", "tamil nadu", "gujarat", "madhya pradesh", "kerala", "odisha",
+})
+
+
+def _index_slabs(slabs: tuple) -> tuple:
+    """Split a slab table into parallel (upper limits, lower limits, rates, bases) for bisect lookup."""
+    uppers = tuple(upper for upper, _, _ in slabs)
+    lowers = (0,) + uppers[:-1]
+    return uppers, lowers, tuple(rate for _, rate, _ in slabs), tuple(base for _, _, base in slabs)
+
+
+_OLD_REGIME_INDEX = _index_slabs(OLD_REGIME_SLABS)
+_NEW_REGIME_INDEX = _index_slabs(NEW_REGIME_SLABS)
+
+
+def _slab_tax(taxable_income: float, index: tuple, rebate_limit: float) -> float:
+    """Base tax (before cess) for taxable income under an indexed slab table, with the 87A rebate applied."""
+    if taxable_income <= rebate_limit:
+        return 0
+    uppers, lowers, rates, bases = index
+    # First slab whose upper limit is >= income (limits are inclusive)
+    i = bisect_left(uppers, taxable_income)
+    return bases[i] + (taxable_income - lowers[i]) * rates[i]
+
+
+@dataclass(frozen=True, slots=True)
+class TaxInputs:
+    """Engine inputs coerced to numbers once, shared by both regime calculations."""
+    annual_income: float = 0.0
+    income_from_interest: float = 0.0
+    income_from_other_sources: float = 0.0
+    section_80c: float = 0.0
+    section_80d: float = 0.0
+    section_80ccd_1b: float = 0.0
+    section_80tta: float = 0.0
+    home_loan_interest: float = 0.0
+    hra_received: float = 0.0
+    rent_paid: float = 0.0
+    state: str = "Delhi"
+    city_type: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TaxInputs":
+        def num(key: str) -> float:
+            return float(data.get(key, 0) or 0)
+
+        return cls(
+            annual_income=num("annual_income"),
+            income_from_interest=num("income_from_interest"),
+            income_from_other_sources=num("income_from_other_sources"),
+            section_80c=num("section_80c"),
+            section_80d=num("section_80d"),
+            section_80ccd_1b=num("section_80ccd_1b"),
+            section_80tta=num("section_80tta"),
+            home_loan_interest=num("home_loan_interest"),
+            hra_received=num("hra_received"),
+            rent_paid=num("rent_paid"),
+            state=data.get("state") or "Delhi",
+            city_type=data.get("city_type") or "",
+        )
+
+
+def _as_inputs(data: TaxInputs | dict) -> TaxInputs:
+    return data if isinstance(data, TaxInputs) else TaxInputs.from_dict(data)
+
 
 def get_professional_tax(state: str, gross_income: float) -> float:
     """Annual Professional Tax based on State and Gross Income (simplified)."""
-    state = state.lower().strip()
-    high_pt_states = [
-        "maharashtra", "karnataka", "telangana", "andhra pradesh",
-        "west bengal", "tamil nadu", "gujarat", "madhya pradesh", "kerala", "odisha"
-    ]
-    if state in high_pt_states:
-        if gross_income > 150000:
-            return 2500
-        if gross_income > 100000:
-            return 2000
+    # Only the income band matters, so cache on the band rather than the exact amount
+    if gross_income > 150000:
+        band = 2
+    elif gross_income > 100000:
+        band = 1
+    else:
+        band = 0
+    return _professional_tax_for_band(state, band)
+
+
+@lru_cache(maxsize=256)
+def _professional_tax_for_band(state: str, band: int) -> float:
+    if state.lower().strip() in _HIGH_PT_STATES:
+        return (0, 2000, 2500)[band]
     return 0
 
 
-def calculate_tax_old_regime(data: dict) -> dict:
-    """Compute tax under Old Regime with deductions (80C, 80D, 80CCD(1B), 80TTA, 24(b), HRA, Standard Deduction)."""
-    salary = float(data.get("annual_income", 0) or 0)
-    interest = float(data.get("income_from_interest", 0) or 0)
-    other = float(data.get("income_from_other_sources", 0) or 0)
+def _old_regime_kernel(
+    salary: float, interest: float, other: float, prof_tax: float,
+    ded_80c: float, ded_80d: float, ded_80ccd_1b: float, ded_80tta: float,
+    home_loan_interest: float, hra_received: float, rent_paid: float, is_metro: bool,
+) -> tuple:
+    """Old Regime arithmetic on plain numbers (deductions already capped).
+    Returns (gross, total_deductions, taxable, base_tax, cess, total_tax, hra_exemption)."""
     gross_income = salary + interest + other
 
-    prof_tax = get_professional_tax(data.get("state", "Delhi"), gross_income)
-
-    ded_80c = min(float(data.get("section_80c", 0) or 0), 150000)
-    ded_80d = min(float(data.get("section_80d", 0) or 0), 25000)
-    ded_80ccd_1b = min(float(data.get("section_80ccd_1b", 0) or 0), 50000)
-    ded_80tta = min(float(data.get("section_80tta", 0) or 0), 10000)
-    home_loan_interest = min(float(data.get("home_loan_interest", 0) or 0), 200000)
-
-    std_deduction = 50000
-    hra_exemption = 0
-    hra_received = float(data.get("hra_received", 0) or 0)
-    rent_paid = float(data.get("rent_paid", 0) or 0)
-    if hra_received > 0 and rent_paid > 0 and salary > 0:
-        actual_hra = hra_received
-        rent_minus_10 = max(0, rent_paid - 0.10 * salary)
-        is_metro = (data.get("city_type") or "").strip().lower() == "metro"
-        limit_pct = 0.50 if is_metro else 0.40
-        hra_limit = limit_pct * salary
-        hra_exemption = min(actual_hra, rent_minus_10, hra_limit)
+    # Least of HRA received, rent over 10% of salary, and 50%/40% of salary; any zero input yields 0
+    rent_minus_10 = max(0.0, rent_paid - 0.10 * salary)
+    hra_limit = (0.50 if is_metro else 0.40) * salary
+    hra_exemption = max(0.0, min(hra_received, rent_minus_10, hra_limit))
 
     total_deductions = (
-        std_deduction + prof_tax + ded_80c + ded_80d + ded_80ccd_1b
+        STANDARD_DEDUCTION + prof_tax + ded_80c + ded_80d + ded_80ccd_1b
         + ded_80tta + home_loan_interest + hra_exemption
     )
     taxable_income = max(0, gross_income - total_deductions)
 
-    # Old regime slabs
-    if taxable_income <= 250000:
-        base_tax = 0
-    elif taxable_income <= 500000:
-        base_tax = (taxable_income - 250000) * 0.05
-    elif taxable_income <= 1000000:
-        base_tax = 12500 + (taxable_income - 500000) * 0.20
-    else:
-        base_tax = 112500 + (taxable_income - 1000000) * 0.30
+    base_tax = _slab_tax(taxable_income, _OLD_REGIME_INDEX, OLD_REGIME_REBATE_LIMIT)
+    cess = base_tax * 0.04
+    return gross_income, total_deductions, taxable_income, base_tax, cess, base_tax + cess, hra_exemption
 
-    if taxable_income <= 500000:
-        base_tax = 0  # Rebate 87A
 
+def _new_regime_kernel(salary: float, interest: float, other: float) -> tuple:
+    """New Regime arithmetic on plain numbers.
+    Returns (gross, total_deductions, taxable, base_tax, cess, total_tax)."""
+    gross_income = salary + interest + other
+
+    total_deductions = STANDARD_DEDUCTION if salary > 0 else 0
+    taxable_income = max(0, gross_income - total_deductions)
+
+    base_tax = _slab_tax(taxable_income, _NEW_REGIME_INDEX, NEW_REGIME_REBATE_LIMIT)
     cess = base_tax * 0.04
-    total_tax = base_tax + cess
+    return gross_income, total_deductions, taxable_income, base_tax, cess, base_tax + cess
+
+
+def calculate_tax_old_regime(data: TaxInputs | dict) -> dict:
+    """Compute tax under Old Regime with deductions (80C, 80D, 80CCD(1B), 80TTA, 24(b), HRA, Standard Deduction)."""
+    ti = _as_inputs(data)
+
+    prof_tax = get_professional_tax(
+        ti.state, ti.annual_income + ti.income_from_interest + ti.income_from_other_sources
+    )
+
+    ded_80c = min(ti.section_80c, 150000)
+    ded_80d = min(ti.section_80d, 25000)
+    ded_80ccd_1b = min(ti.section_80ccd_1b, 50000)
+    ded_80tta = min(ti.section_80tta, 10000)
+    home_loan_interest = min(ti.home_loan_interest, 200000)
+    is_metro = ti.city_type.strip().lower() == "metro"
+
+    gross_income, total_deductions, taxable_income, base_tax, cess, total_tax, hra_exemption = _old_regime_kernel(
+        ti.annual_income, ti.income_from_interest, ti.income_from_other_sources, prof_tax,
+        ded_80c, ded_80d, ded_80ccd_1b, ded_80tta,
+        home_loan_interest, ti.hra_received, ti.rent_paid, is_metro,
+    )
 
     return {
         "regime": "Old Regime",
@@ -77,7 +181,7 @@ def calculate_tax_old_regime(data: dict) -> dict:
         "cess": round(cess, 2),
         "total_tax_payable": round(total_tax, 2),
         "components": {
-            "Standard Deduction": std_deduction,
+            "Standard Deduction": STANDARD_DEDUCTION,
             "80C": ded_80c,
             "80D": ded_80d,
             "80CCD(1B) (NPS)": ded_80ccd_1b,
@@ -89,36 +193,13 @@ def calculate_tax_old_regime(data: dict) -> dict:
     }
 
 
-def calculate_tax_new_regime(data: dict) -> dict:
+def calculate_tax_new_regime(data: TaxInputs | dict) -> dict:
     """Compute tax under New Regime (Standard Deduction only for salaried)."""
-    salary = float(data.get("annual_income", 0) or 0)
-    interest_income = float(data.get("income_from_interest", 0) or 0)
-    other_income = float(data.get("income_from_other_sources", 0) or 0)
-    gross_income = salary + interest_income + other_income
-
-    std_deduction = 50000 if salary > 0 else 0
-    total_deductions = std_deduction
-    taxable_income = max(0, gross_income - total_deductions)
-
-    # New regime slabs
-    if taxable_income <= 300000:
-        base_tax = 0
-    elif taxable_income <= 600000:
-        base_tax = (taxable_income - 300000) * 0.05
-    elif taxable_income <= 900000:
-        base_tax = 15000 + (taxable_income - 600000) * 0.10
-    elif taxable_income <= 1200000:
-        base_tax = 45000 + (taxable_income - 900000) * 0.15
-    elif taxable_income <= 1500000:
-        base_tax = 90000 + (taxable_income - 1200000) * 0.20
-    else:
-        base_tax = 150000 + (taxable_income - 1500000) * 0.30
+    ti = _as_inputs(data)
 
-    if taxable_income <= 700000:
-        base_tax = 0  # Rebate 87A New Regime
-
-    cess = base_tax * 0.04
-    total_tax = base_tax + cess
+    gross_income, total_deductions, taxable_income, base_tax, cess, total_tax = _new_regime_kernel(
+        ti.annual_income, ti.income_from_interest, ti.income_from_other_sources,
+    )
 
     return {
         "regime": "New Regime",
@@ -131,21 +212,23 @@ def calculate_tax_new_regime(data: dict) -> dict:
     }
 
 
-def calculate_comprehensive(data: dict) -> dict:
+def calculate_comprehensive(data: TaxInputs | dict) -> dict:
     """Compute both regimes and return comparison + best regime and suggestions."""
-    old_r = calculate_tax_old_regime(data)
-    new_r = calculate_tax_new_regime(data)
+    ti = _as_inputs(data)
+    # Both regimes are always computed: callers show each regime's full breakdown, not just the winner
+    old_r = calculate_tax_old_regime(ti)
+    new_r = calculate_tax_new_regime(ti)
     best = "New Regime" if new_r["total_tax_payable"] < old_r["total_tax_payable"] else "Old Regime"
     tax_saved = abs(old_r["total_tax_payable"] - new_r["total_tax_payable"])
 
     suggestions = []
-    if (data.get("section_80c") or 0) < 150000:
-        gap = 150000 - (data.get("section_80c") or 0)
+    if ti.section_80c < 150000:
+        gap = 150000 - ti.section_80c
         suggestions.append(f"Invest ₹{gap:,.0f} more in 80C (PPF, ELSS, LIC) to save tax in Old Regime.")
-    if (data.get("section_80ccd_1b") or 0) < 50000:
-        gap = 50000 - (data.get("section_80ccd_1b") or 0)
+    if ti.section_80ccd_1b < 50000:
+        gap = 50000 - ti.section_80ccd_1b
         suggestions.append(f"Invest ₹{gap:,.0f} in NPS (80CCD(1B)) for extra deduction in Old Regime.")
-    if (data.get("section_80d") or 0) == 0:
+    if ti.section_80d == 0:
         suggestions.append("Consider Health Insurance (80D) for yourself/parents if you choose Old Regime.")
 
     return {
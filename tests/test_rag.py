@@ -0,0 +1,22 @@
+from rag import MAX_PROMPT_CHARS_PER_CHUNK, _compact_for_prompt
+
+
+def test_compact_short_body_is_unchanged():
+    assert _compact_for_prompt("- Rule one.\n\n\n- Rule   two.") == "- Rule one.\n- Rule two."
+
+
+def test_compact_keeps_opening_and_closing_sentence():
+    body = "Opening sentence. " * 150 + "Closing sentence."
+    out = _compact_for_prompt(body)
+    assert len(out) <= MAX_PROMPT_CHARS_PER_CHUNK
+    assert out.startswith("Opening sentence.")
+    assert out.endswith("\n…\nClosing sentence.")
+
+
+def test_compact_caps_body_with_long_last_sentence():
+    tail = "This closing sentence runs on " + "and on " * 400 + "forever."
+    body = "Short opening. " * 100 + tail
+    out = _compact_for_prompt(body)
+    assert len(out) <= MAX_PROMPT_CHARS_PER_CHUNK
+    assert out.count("forever.") == 0
+    assert out.startswith("Short opening.")
@@ -0,0 +1,60 @@
+import pytest
+
+from tax_engine import calculate_comprehensive, calculate_tax_old_regime
+
+
+def _taxes(salary: float) -> tuple[float, float]:
+    """(old, new) total tax for a Delhi salary with no deductions (taxable = salary - 50,000)."""
+    result = calculate_comprehensive({"annual_income": salary, "state": "Delhi"})
+    return result["old_regime"]["total_tax_payable"], result["new_regime"]["total_tax_payable"]
+
+
+@pytest.mark.parametrize("salary, expected_old", [
+    (550000, 0),            # taxable 5,00,000: 87A rebate limit is inclusive
+    (550001, 13000.21),     # just past the rebate: 12,500 + 0.20 on the first rupee of the 20% slab, + 4% cess
+    (1050000, 117000.0),    # taxable 10,00,000: top of the 20% slab
+    (1050001, 117000.31),   # first rupee in the 30% slab
+])
+def test_old_regime_at_rebate_and_slab_limits(salary, expected_old):
+    assert _taxes(salary)[0] == expected_old
+
+
+@pytest.mark.parametrize("salary, expected_new", [
+    (750000, 0),            # taxable 7,00,000: 87A rebate limit is inclusive
+    (750001, 26000.1),      # just past the rebate, inside the 10% slab
+    (950000, 46800.0),      # taxable 9,00,000: top of the 10% slab
+    (1550000, 156000.0),    # taxable 15,00,000: top of the 20% slab
+    (1550001, 156000.31),   # first rupee in the 30% slab
+])
+def test_new_regime_at_rebate_and_slab_limits(salary, expected_new):
+    assert _taxes(salary)[1] == expected_new
+
+
+@pytest.mark.parametrize("salary, hra, rent", [
+    (600000, 0, 240000),    # no HRA received
+    (600000, 200000, 0),    # no rent paid
+    (0, 200000, 240000),    # no salary
+    (600000, 200000, 50000),  # rent below 10% of salary
+])
+def test_hra_exemption_is_zero_when_any_input_is_zero(salary, hra, rent):
+    old = calculate_tax_old_regime({"annual_income": salary, "hra_received": hra, "rent_paid": rent})
+    assert old["components"]["HRA Exemption"] == 0
+
+
+@pytest.mark.parametrize("city_type, expected", [
+    ("Metro", 180000),      # rent - 10% salary is the least
+    ("Non-Metro", 180000),
+])
+def test_hra_exemption_least_of_three(city_type, expected):
+    old = calculate_tax_old_regime({
+        "annual_income": 600000, "hra_received": 200000, "rent_paid": 240000, "city_type": city_type,
+    })
+    assert old["components"]["HRA Exemption"] == expected
+
+
+def test_hra_exemption_capped_by_salary_percentage():
+    # Non-metro limit is 40% of salary (2,40,000), below both HRA received and rent - 10%
+    old = calculate_tax_old_regime({
+        "annual_income": 600000, "hra_received": 300000, "rent_paid": 400000, "city_type": "Non-Metro",
+    })
+    assert old["components"]["HRA Exemption"] == 240000